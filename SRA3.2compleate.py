@@ -2,14 +2,35 @@ import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, filedialog
 import subprocess
 import threading
-import time
+import asyncio
+import queue
+import collections
+import concurrent.futures
+import errno
+import shutil
+import signal
+import tempfile
 import sys
 import logging
 import os
+import platform
 import json
+import random
+import re
 import webbrowser
 
 CONFIG_FILE = "sra_gui_config.json"
+CONFIG_VERSION = 2
+MAX_CONCURRENT_JOBS = 4     # Child processes allowed to run at the same time
+COMMAND_TIMEOUT = 300       # Seconds before a single command is killed
+UI_POLL_INTERVAL = 50       # Milliseconds between UI event queue drains
+STREAM_LIMIT = 1024 * 1024  # Longest line read from a child process stream
+TERMINATE_GRACE = 10        # Seconds between SIGTERM and SIGKILL on cancel
+RETRY_MAX_ATTEMPTS = 8      # Attempts per batch download before giving up
+RETRY_BASE_DELAY = 5        # Seconds; doubled after every failed attempt
+RETRY_MAX_DELAY = 120       # Upper bound on a single backoff delay; reached by the 6th retry
+BATCH_FAILURE_REPORT = "batch_prefetch_failures.txt"
+SCRATCH_SUBDIR = "sra-gui-scratch"  # Per-job staging dirs live here inside the scratch dir
 
 # Setup logging configuration
 logging.basicConfig(
@@ -49,25 +70,734 @@ class ToolTip:
             self.tooltip.destroy()
             self.tooltip = None
 
+def partial_path(final_path):
+    # Hidden sibling of final_path, so the rename on success stays on one filesystem
+    directory, name = os.path.split(os.path.abspath(final_path))
+    return os.path.join(directory, f".{name}.partial")
+
+def remove_path(path):
+    # Move into a fresh, uniquely named dir first, so a half-deleted tree is never visible under
+    # its real name and a leftover from an interrupted delete can never block the rename
+    if not os.path.lexists(path):
+        return
+    directory, name = os.path.split(os.path.abspath(path))
+    doomed = tempfile.mkdtemp(prefix=f".{name}.deleting-", dir=directory)
+    os.replace(path, os.path.join(doomed, name))
+    shutil.rmtree(doomed, ignore_errors=True)
+
+# SRA toolkit errors carry RC(module,target,context,object,state); these parts mark a retryable failure
+TRANSIENT_RC_PARTS = {"rcTimeout", "rcConnection", "rcExhausted", "rcBusy", "rcIncomplete",
+                      "rcInterrupted", "rcCanceled", "rcTransfer", "rcNS"}
+PERMANENT_RC_PARTS = {"rcNotFound", "rcUnauthorized", "rcInvalid", "rcCorrupt", "rcUnsupported",
+                      "rcUnrecognized", "rcNoPerm", "rcExists", "rcInsufficient"}
+TRANSIENT_PATTERNS = [
+    r"time ?out", r"timed out", r"connection (reset|refused|failed|closed)", r"temporar(y|ily)",
+    r"network", r"unreachable", r"\b(429|500|502|503|504)\b", r"try again", r"broken pipe",
+    r"transfer incomplete", r"name resolution",
+]
+PERMANENT_PATTERNS = [
+    r"not found", r"\b(400|401|403|404)\b", r"invalid accession", r"no data", r"access denied",
+    r"permission denied", r"unauthori[sz]ed", r"forbidden", r"no space left", r"disk quota exceeded",
+    r"failed to resolve accession",
+]
+RC_TUPLE_PATTERN = re.compile(r"RC\(([^)]*)\)")
+RC_CODE_PATTERN = re.compile(r"\brc\s*[=:]?\s*(0x[0-9a-fA-F]+|\d{6,})", re.IGNORECASE)
+
+def classify_failure(returncode, stderr_text, rc_explanation=""):
+    # Returns ("transient" | "permanent" | "unknown", reason)
+    text = f"{stderr_text}\n{rc_explanation}"
+    for match in RC_TUPLE_PATTERN.finditer(text):
+        parts = {part.strip() for part in match.group(1).split(",")}
+        if parts & PERMANENT_RC_PARTS:
+            return "permanent", f"RC({match.group(1)})"
+        if parts & TRANSIENT_RC_PARTS:
+            return "transient", f"RC({match.group(1)})"
+    for pattern in PERMANENT_PATTERNS:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            return "permanent", match.group(0)
+    for pattern in TRANSIENT_PATTERNS:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            return "transient", match.group(0)
+    if returncode is not None and returncode < 0:
+        return "transient", f"killed by signal {-returncode}"
+    return "unknown", f"exit code {returncode}"
+
+class RetryPolicy:
+    def __init__(self, max_attempts=RETRY_MAX_ATTEMPTS, base_delay=RETRY_BASE_DELAY,
+                 max_delay=RETRY_MAX_DELAY, unknown_attempts=2):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.unknown_attempts = unknown_attempts  # failures we cannot classify get fewer tries
+
+    def attempt_limit(self, failure_class):
+        if failure_class == "transient":
+            return self.max_attempts
+        if failure_class == "unknown":
+            return min(self.unknown_attempts, self.max_attempts)
+        return 1
+
+    def should_retry(self, failure_class, attempt):
+        return attempt < self.attempt_limit(failure_class)
+
+    def delay(self, attempt):
+        # Full jitter keeps a batch of failed downloads from retrying in lockstep
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+def copy_path(src, dst, buffer_size=STREAM_LIMIT, abort=None):
+    # `abort` is a threading.Event checked between chunks, so a cancelled job stops copying promptly
+    def copy_file(src_file, dst_file):
+        with open(src_file, "rb") as fsrc, open(dst_file, "wb") as fdst:
+            while True:
+                if abort is not None and abort.is_set():
+                    raise InterruptedError(f"Copy of {src_file} aborted")
+                chunk = fsrc.read(buffer_size)
+                if not chunk:
+                    break
+                fdst.write(chunk)
+        shutil.copystat(src_file, dst_file)
+    if os.path.isdir(src):
+        shutil.copytree(src, dst, copy_function=copy_file)
+    else:
+        copy_file(src, dst)
+
+def move_path(src, dst, buffer_size=STREAM_LIMIT):
+    try:
+        os.replace(src, dst)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    # Across filesystems: copy beside dst under a partial name, then rename so dst appears atomically
+    temp = partial_path(dst)
+    if os.path.lexists(temp):
+        remove_path(temp)
+    try:
+        copy_path(src, temp, buffer_size)
+        os.replace(temp, dst)
+    except BaseException:
+        if os.path.lexists(temp):
+            remove_path(temp)
+        raise
+    remove_path(src)
+
+def stage_input(src, dst, buffer_size=STREAM_LIMIT, abort=None):
+    # A hardlink is free when scratch shares the input's filesystem; otherwise copy
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+    temp = partial_path(dst)
+    try:
+        copy_path(src, temp, buffer_size, abort)
+        os.replace(temp, dst)
+    except BaseException:
+        if os.path.lexists(temp):
+            remove_path(temp)
+        raise
+
+def path_size(path):
+    if not os.path.isdir(path) or os.path.islink(path):
+        return os.lstat(path).st_size
+    total = 0
+    for dirpath, dirnames, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                pass
+    return total
+
+def enforce_scratch_quota(scratch_root, quota, active_dirs, needed=0):
+    # Remove the oldest leftover staging dirs until `needed` more bytes fit under `quota`
+    if not quota or not os.path.isdir(scratch_root):
+        return
+    usage = 0
+    stale = []
+    for name in os.listdir(scratch_root):
+        path = os.path.join(scratch_root, name)
+        try:
+            size = path_size(path)
+            mtime = os.lstat(path).st_mtime
+        except OSError:
+            continue
+        usage += size
+        if path not in active_dirs:
+            stale.append((mtime, path, size))
+    for mtime, path, size in sorted(stale):
+        if usage + needed <= quota:
+            break
+        try:
+            remove_path(path)
+            usage -= size
+            logging.info(f"Removed stale scratch dir {path} to stay under quota")
+        except OSError as e:
+            logging.error(f"Failed to remove stale scratch dir {path}: {e}")
+    if usage + needed > quota:
+        logging.warning(f"Scratch usage {usage + needed} bytes exceeds quota {quota} bytes; "
+                        "active jobs are holding the space")
+
+class Job:
+    """A single command submitted to the ProcessOrchestrator."""
+    def __init__(self, cmd, on_output=None, on_done=None, timeout=COMMAND_TIMEOUT):
+        self.cmd = cmd
+        self.name = None            # label used in progress messages and reports
+        self.on_output = on_output  # called as on_output(stream, line) on the Tk thread
+        self.on_done = on_done      # called as on_done(job) on the Tk thread
+        self.timeout = timeout
+        self.process = None
+        self.task = None
+        self.status = "queued"      # queued, running, completed, failed, timeout, cancelled, error
+        self.returncode = None
+        self.error = None
+        self.stderr_lines = []
+        self.partial_paths = []     # removed unless the job completes
+        self.outputs = []           # (temp, final) pairs renamed when the job completes
+        self.output_dirs = []       # (temp_dir, final_dir) whose contents are moved on completion
+        self.env = None             # environment for the child; None inherits ours
+        self.staging_dir = None     # scratch dir removed when the job ends, whatever the outcome
+        self.stage_inputs = []      # (source, staged) pairs linked or copied in before the first run
+        self.staged = False
+        self.retry_policy = None
+        self.on_retry = None        # called as on_retry(job, delay) on the Tk thread
+        self.attempts = 0
+        self.failure_class = None
+        self.failure_reason = None
+        self.cancel_requested = False
+        self.terminating = False
+        self.finishing = False      # set once cleanup starts; the job can no longer be cancelled
+        self.abort = threading.Event()  # tells executor-side copies of a cancelled job to stop
+
+    def register_partial(self, path):
+        self.partial_paths.append(path)
+
+    def register_output(self, temp_path, final_path):
+        self.register_partial(temp_path)
+        self.outputs.append((temp_path, final_path))
+
+    def register_output_dir(self, temp_dir, final_dir):
+        self.register_partial(temp_dir)
+        self.output_dirs.append((temp_dir, final_dir))
+
+    def register_staged_input(self, source_path, staged_path):
+        self.stage_inputs.append((source_path, staged_path))
+
+    def stage(self, buffer_size=STREAM_LIMIT):
+        for source_path, staged_path in self.stage_inputs:
+            stage_input(source_path, staged_path, buffer_size, self.abort)
+        self.staged = True
+
+    def finalize_outputs(self, buffer_size=STREAM_LIMIT):
+        for temp_path, final_path in self.outputs:
+            if os.path.lexists(final_path):
+                remove_path(final_path)
+            move_path(temp_path, final_path, buffer_size)
+        for temp_dir, final_dir in self.output_dirs:
+            for name in os.listdir(temp_dir):
+                final_path = os.path.join(final_dir, name)
+                if os.path.isdir(final_path) and not os.path.islink(final_path):
+                    remove_path(final_path)
+                move_path(os.path.join(temp_dir, name), final_path, buffer_size)
+            os.rmdir(temp_dir)
+
+    def remove_staging(self):
+        if self.staging_dir:
+            try:
+                remove_path(self.staging_dir)
+            except OSError as e:
+                logging.error(f"Failed to remove scratch dir {self.staging_dir}: {e}")
+
+    def remove_partials(self):
+        for path in self.partial_paths:
+            try:
+                remove_path(path)
+            except OSError as e:
+                logging.error(f"Failed to remove partial output {path}: {e}")
+
+class ConcurrencyLimiter:
+    """Like asyncio.Semaphore, but the limit can change while jobs are waiting."""
+    def __init__(self, limit):
+        self.limit = limit
+        self.active = 0
+        self._waiters = collections.deque()
+
+    async def __aenter__(self):
+        while self.active >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Pass on a wake-up we were given but can no longer use
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.active += 1
+
+    async def __aexit__(self, *exc_info):
+        self.active -= 1
+        self._wake()
+
+    def set_limit(self, limit):
+        self.limit = limit
+        self._wake()
+
+    def _wake(self):
+        free = self.limit - self.active
+        for waiter in self._waiters:
+            if free <= 0:
+                break
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+class ProcessOrchestrator:
+    """Runs child processes on one asyncio event loop in a background thread.
+
+    Callbacks are never invoked from the loop thread; they are put on
+    ``ui_queue`` and the Tk side drains that queue from its own mainloop.
+    """
+    def __init__(self, ui_queue, max_concurrent=MAX_CONCURRENT_JOBS):
+        self.ui_queue = ui_queue
+        self.max_concurrent = max_concurrent
+        self.stream_limit = STREAM_LIMIT
+        self.io_buffer_size = STREAM_LIMIT  # chunk size for staging copies and output moves
+        self.scratch_quota = 0      # bytes; 0 means unlimited
+        self.jobs = set()
+        self.loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self.thread = threading.Thread(target=self._run_loop, daemon=True)
+        self.thread.start()
+        self._ready.wait()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.limiter = ConcurrencyLimiter(self.max_concurrent)
+        self._ready.set()
+        self.loop.run_forever()
+
+    # ---- Thread-safe API (called from the Tk thread) ----
+    def submit(self, job):
+        self.loop.call_soon_threadsafe(self._schedule, job)
+        return job
+
+    def cancel(self, job):
+        self.loop.call_soon_threadsafe(self._cancel, job)
+
+    def cancel_all(self):
+        self.loop.call_soon_threadsafe(self._cancel_all)
+
+    def set_concurrency(self, max_concurrent):
+        self.loop.call_soon_threadsafe(self._set_concurrency, max_concurrent)
+
+    def shutdown(self, timeout=TERMINATE_GRACE + 2):
+        # Block until every job has been terminated and cleaned up, then stop the loop
+        future = asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop)
+        try:
+            future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            logging.warning("Timed out waiting for jobs to stop during shutdown")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(1)
+        # Anything still alive now would outlive us in its own session, so kill it outright
+        for job in list(self.jobs):
+            if job.process is not None and job.process.returncode is None:
+                if os.name == 'nt':
+                    subprocess.run(["taskkill", "/F", "/T", "/PID", str(job.process.pid)],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                else:
+                    self._signal_group(job, signal.SIGKILL)
+
+    # ---- Loop-side implementation ----
+    def _post(self, callback, *args):
+        if callback:
+            self.ui_queue.put((callback, args))
+
+    def _schedule(self, job):
+        self.jobs.add(job)
+        job.task = self.loop.create_task(self._execute(job))
+
+    def _cancel(self, job):
+        job.cancel_requested = True
+        # A job already being terminated or cleaned up must not be interrupted
+        if job.task and not job.task.done() and not job.terminating and not job.finishing:
+            job.task.cancel()
+
+    def _set_concurrency(self, max_concurrent):
+        # Applies to queued jobs too; running jobs above a lowered limit are left to finish
+        self.max_concurrent = max_concurrent
+        self.limiter.set_limit(max_concurrent)
+
+    def _cancel_all(self):
+        for job in list(self.jobs):
+            self._cancel(job)
+
+    async def _shutdown(self):
+        tasks = [job.task for job in self.jobs if job.task]
+        self._cancel_all()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _read_stream(self, job, stream, name):
+        while True:
+            line = await stream.readline()
+            if not line:
+                break
+            text = line.decode(errors="replace")
+            if name == "stderr":
+                job.stderr_lines.append(text)
+            self._post(job.on_output, name, text)
+
+    async def _execute(self, job):
+        try:
+            while True:
+                job.attempts += 1
+                job.stderr_lines = []
+                # The previous attempt's pid may already belong to someone else; never signal it
+                job.process = None
+                job.returncode = None
+                await self._run_once(job)
+                if job.cancel_requested:
+                    job.status = "cancelled"
+                if job.status not in ("failed", "timeout") or job.retry_policy is None:
+                    break
+                try:
+                    job.failure_class, job.failure_reason = await self._classify(job)
+                except asyncio.CancelledError:
+                    job.status = "cancelled"
+                    break
+                if not job.retry_policy.should_retry(job.failure_class, job.attempts):
+                    break
+                delay = job.retry_policy.delay(job.attempts)
+                logging.warning(f"Retrying {' '.join(job.cmd)} in {delay:.1f}s after "
+                                f"{job.failure_class} failure: {job.failure_reason}")
+                self._post(job.on_retry, job, delay)
+                try:
+                    # Sleeping outside the limiter lets other queued jobs use the slot
+                    await asyncio.sleep(delay)
+                except asyncio.CancelledError:
+                    job.status = "cancelled"
+                    break
+        finally:
+            # Every job must be cleaned up, forgotten and reported, however it ended
+            job.finishing = True
+            try:
+                await self._finish(job)
+            finally:
+                self.jobs.discard(job)
+                self._post(job.on_done, job)
+
+    async def _finish(self, job):
+        # Run cleanup in its own task so a cancel already in flight cannot leave outputs half-moved
+        cleanup = self.loop.create_task(self._cleanup(job))
+        while not cleanup.done():
+            try:
+                await asyncio.shield(cleanup)
+            except asyncio.CancelledError:
+                pass
+        cleanup.result()
+
+    async def _run_once(self, job):
+        try:
+            async with self.limiter:
+                job.status = "running"
+                if job.stage_inputs and not job.staged:
+                    await self._stage(job)
+                logging.info(f"Executing command: {' '.join(job.cmd)}")
+                # Each child leads its own process group so helpers it spawns can be signalled too
+                if os.name == 'nt':
+                    group_args = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+                else:
+                    group_args = {'start_new_session': True}
+                job.process = await asyncio.create_subprocess_exec(
+                    *job.cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+                    limit=self.stream_limit, env=job.env, **group_args)
+                await asyncio.wait_for(asyncio.gather(
+                    self._read_stream(job, job.process.stdout, "stdout"),
+                    self._read_stream(job, job.process.stderr, "stderr"),
+                    job.process.wait()), job.timeout)
+                job.returncode = job.process.returncode
+                job.status = "completed" if job.returncode == 0 else "failed"
+        except asyncio.TimeoutError:
+            job.status = "timeout"
+            await self._terminate(job)
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            await self._terminate(job)
+        except Exception as e:
+            job.status = "error"
+            job.error = str(e)
+            logging.exception("Error during command execution")
+            # e.g. a line longer than the stream limit: nothing reads the pipes any more, so stop the child
+            await self._terminate(job)
+
+    async def _classify(self, job):
+        if job.status == "timeout":
+            return "transient", f"timed out after {job.timeout} seconds"
+        stderr_text = "".join(job.stderr_lines)
+        explanation = ""
+        match = RC_CODE_PATTERN.search(stderr_text)
+        if match and not RC_TUPLE_PATTERN.search(stderr_text):
+            explanation = await self._rcexplain(match.group(1))
+        return classify_failure(job.returncode, stderr_text, explanation)
+
+    async def _rcexplain(self, code):
+        # Turn a bare numeric rc into RC(...) text that classify_failure understands
+        if code.lower().startswith("0x"):
+            code = str(int(code, 16))
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "rcexplain", code, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT)
+        except OSError as e:
+            logging.warning(f"rcexplain {code} failed: {e}")
+            return ""
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(), 10)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            logging.warning(f"rcexplain {code} timed out")
+            return ""
+        except asyncio.CancelledError:
+            proc.kill()
+            raise
+        return stdout.decode(errors="replace")
+
+    async def _stage(self, job):
+        # Runs inside the limiter so queued jobs do not all copy onto scratch at once
+        active_dirs = {other.staging_dir for other in self.jobs if other.staging_dir}
+        needed = sum(path_size(source) for source, _ in job.stage_inputs)
+        await self.loop.run_in_executor(None, enforce_scratch_quota, os.path.dirname(job.staging_dir),
+                                        self.scratch_quota, active_dirs, needed)
+        copy = self.loop.run_in_executor(None, job.stage, self.io_buffer_size)
+        try:
+            await asyncio.shield(copy)
+        except asyncio.CancelledError:
+            # Stop the copy thread and wait for it, so cleanup never races it for the staging dir
+            job.abort.set()
+            while not copy.done():
+                try:
+                    await asyncio.shield(copy)
+                except asyncio.CancelledError:
+                    pass
+                except Exception:
+                    break   # normally the InterruptedError raised by the aborted copy
+            raise
+        self._post(job.on_output, "stdout", f"Staged input on scratch: {job.staging_dir}\n")
+
+    async def _cleanup(self, job):
+        # Called after the limiter slot is released, so the next job starts while outputs are moved
+        try:
+            if job.status == "completed":
+                await self.loop.run_in_executor(None, job.finalize_outputs, self.io_buffer_size)
+        except OSError as e:
+            job.status = "error"
+            job.error = f"Failed to move outputs into place: {e}"
+            logging.exception("Error finalizing job outputs")
+        if job.status != "completed":
+            await self.loop.run_in_executor(None, job.remove_partials)
+        await self.loop.run_in_executor(None, job.remove_staging)
+
+    def _signal_group(self, job, sig):
+        try:
+            if os.name == 'nt':
+                job.process.send_signal(sig)
+            else:
+                os.killpg(job.process.pid, sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    async def _terminate(self, job):
+        if job.process is None:
+            return
+        job.terminating = True
+        try:
+            await self._terminate_group(job)
+        finally:
+            job.terminating = False
+
+    async def _terminate_group(self, job):
+        if job.process.returncode is None:
+            self._signal_group(job, signal.CTRL_BREAK_EVENT if os.name == 'nt' else signal.SIGTERM)
+            try:
+                await asyncio.wait_for(job.process.wait(), TERMINATE_GRACE)
+            except asyncio.TimeoutError:
+                logging.warning(f"Process {job.process.pid} ignored SIGTERM, killing it")
+        if os.name == 'nt':
+            # taskkill /T is the only way to reach grandchildren on Windows
+            if job.process.returncode is None:
+                killer = await asyncio.create_subprocess_exec(
+                    "taskkill", "/F", "/T", "/PID", str(job.process.pid),
+                    stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL)
+                await killer.wait()
+        else:
+            # Helpers may outlive the group leader, so always sweep the whole group
+            self._signal_group(job, signal.SIGKILL)
+        await job.process.wait()
+        job.returncode = job.process.returncode
+
+# Each entry: key -> (expected type, validity check, description used in error messages)
+PROFILE_SCHEMA = {
+    'gzip': (bool, lambda v: True, "true or false"),
+    'tool_threads': (dict, lambda v: all(isinstance(n, int) and not isinstance(n, bool) and n >= 1
+                                     for n in v.values()),
+                     "a mapping of tool name to a positive thread count"),
+    'max_concurrent_jobs': (int, lambda v: 1 <= v <= 256, "between 1 and 256"),
+    'temp_dir': (str, lambda v: v == "" or os.path.isabs(v), "empty or an absolute path"),
+    'scratch_dir': (str, lambda v: v == "" or os.path.isabs(v), "empty or an absolute path"),
+    'io_buffer_size': (int, lambda v: 64 * 1024 <= v <= 256 * 1024 * 1024, "between 64 KiB and 256 MiB"),
+    'scratch_quota_gib': (int, lambda v: v >= 0, "0 (unlimited) or a positive number of GiB"),
+    'stage_inputs': (bool, lambda v: True, "true or false"),
+}
+DEFAULT_PROFILE = {
+    'gzip': False,
+    'tool_threads': {'fastq-dump': 1},
+    'max_concurrent_jobs': MAX_CONCURRENT_JOBS,
+    'temp_dir': "",
+    'scratch_dir': "",
+    'io_buffer_size': STREAM_LIMIT,
+    'scratch_quota_gib': 50,
+    'stage_inputs': False,
+}
+
+def validate_profile(profile):
+    # Returns a complete copy of profile; raises ValueError listing every bad field
+    if not isinstance(profile, dict):
+        raise ValueError("profile must be a JSON object")
+    errors = [f"unknown setting '{key}'" for key in profile if key not in PROFILE_SCHEMA]
+    for key, (expected, check, description) in PROFILE_SCHEMA.items():
+        if key not in profile:
+            continue
+        value = profile[key]
+        # bool is a subclass of int, so reject it explicitly for numeric settings
+        if not isinstance(value, expected) or (expected is int and isinstance(value, bool)) or not check(value):
+            errors.append(f"'{key}' must be {description}")
+    if errors:
+        raise ValueError("; ".join(errors))
+    validated = json.loads(json.dumps(DEFAULT_PROFILE))
+    validated.update(json.loads(json.dumps(profile)))
+    return validated
+
+def default_config():
+    return {'version': CONFIG_VERSION, 'active_profile': "default",
+            'profiles': {'default': dict(DEFAULT_PROFILE)}}
+
+def migrate_config(data):
+    # Version 1 files were a flat {'gzip': ..., 'threads': ...} dict
+    if 'version' not in data:
+        profile = {}
+        if 'gzip' in data:
+            profile['gzip'] = data['gzip']
+        if str(data.get('threads', "")).isdigit():
+            profile['tool_threads'] = {'fastq-dump': int(data['threads'])}
+        data = {'version': CONFIG_VERSION, 'active_profile': "default", 'profiles': {'default': profile}}
+        logging.info("Migrated config file from version 1.")
+    if data.get('version') != CONFIG_VERSION:
+        raise ValueError(f"unsupported config version {data.get('version')}")
+    return data
+
+def validate_config(data):
+    data = migrate_config(data)
+    profiles = data.get('profiles')
+    if not isinstance(profiles, dict) or not profiles:
+        raise ValueError("'profiles' must be a non-empty object")
+    validated = {}
+    for name, profile in profiles.items():
+        try:
+            validated[name] = validate_profile(profile)
+        except ValueError as e:
+            raise ValueError(f"profile '{name}': {e}")
+    active = data.get('active_profile')
+    if active not in validated:
+        raise ValueError(f"active profile '{active}' does not exist")
+    return {'version': CONFIG_VERSION, 'active_profile': active, 'profiles': validated}
+
 def load_defaults():
     if os.path.exists(CONFIG_FILE):
         try:
             with open(CONFIG_FILE, "r") as f:
-                defaults = json.load(f)
+                config = validate_config(json.load(f))
             logging.info("Loaded custom defaults from config file.")
-            return defaults
+            return config
         except Exception as e:
             logging.error("Error loading defaults: " + str(e))
-    return {'gzip': False, 'threads': "1"}
+    return default_config()
 
-def save_defaults_to_file(defaults):
+def save_defaults_to_file(config):
     try:
-        with open(CONFIG_FILE, "w") as f:
-            json.dump(defaults, f)
+        config = validate_config(config)
+        # Write then rename so an interrupted save never leaves a truncated config
+        temp_file = CONFIG_FILE + ".tmp"
+        with open(temp_file, "w") as f:
+            json.dump(config, f, indent=2)
+        os.replace(temp_file, CONFIG_FILE)
         logging.info("Saved custom defaults to config file.")
     except Exception as e:
         logging.error("Error saving defaults: " + str(e))
 
+def total_memory_bytes():
+    if os.name == 'nt':
+        import ctypes
+
+        class MemoryStatus(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                        ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                        ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                        ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                        ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+        status = MemoryStatus()
+        status.dwLength = ctypes.sizeof(MemoryStatus)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullTotalPhys
+        return None
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+def detect_host_resources(path="."):
+    try:
+        free_disk = shutil.disk_usage(path).free
+    except OSError:
+        free_disk = None
+    return {'cpus': os.cpu_count() or 1, 'memory': total_memory_bytes(), 'free_disk': free_disk}
+
+def auto_tune_profile(resources):
+    gib = 1024 ** 3
+    cpus = resources['cpus']
+    memory_gib = (resources['memory'] or 4 * gib) / gib
+    free_disk_gib = (resources['free_disk'] or 0) / gib
+    # Downloads are network bound, so run one job per two cores, with about 2 GiB of RAM per job
+    max_jobs = max(1, min(cpus // 2 or 1, int(memory_gib // 2) or 1, 64))
+    threads = max(1, cpus // max_jobs)
+    # Directories and staging are left to the user; the system temp dir is often not a fast local disk
+    return validate_profile({
+        # Compress output when the disk would otherwise fill up quickly
+        'gzip': free_disk_gib < 200,
+        'tool_threads': {'fastq-dump': threads},
+        'max_concurrent_jobs': max_jobs,
+        'io_buffer_size': (8 if memory_gib >= 32 else 4 if memory_gib >= 8 else 1) * 1024 * 1024,
+        # Leave at least half of the scratch disk for everything else
+        'scratch_quota_gib': max(1, min(int(free_disk_gib // 2), 500)),
+    })
+
+def thread_choices(cpus=None):
+    # Powers of two up to the core count, plus the core count itself
+    cpus = cpus or os.cpu_count() or 1
+    choices = []
+    n = 1
+    while n < cpus:
+        choices.append(str(n))
+        n *= 2
+    choices.append(str(cpus))
+    return choices
+
 def create_about_tab(notebook):
     about_tab = ttk.Frame(notebook)
     notebook.add(about_tab, text="About")
@@ -124,10 +854,16 @@ def create_about_tab(notebook):
 class SraToolkitGUI:
     def __init__(self, root):
         self.root = root
-        self.current_process = None  # For subprocess handling
+        self.config = load_defaults()    # load saved profiles
+        self.custom_defaults = self.config['profiles'][self.config['active_profile']]
+        self.ui_queue = queue.Queue()  # Events from the process orchestrator
+        self.orchestrator = ProcessOrchestrator(self.ui_queue, self.custom_defaults['max_concurrent_jobs'])
+        self.orchestrator.io_buffer_size = self.custom_defaults['io_buffer_size']
+        self.orchestrator.scratch_quota = self.custom_defaults['scratch_quota_gib'] * 1024 ** 3
+        self.running_jobs = 0          # Jobs submitted and not yet finished
         self.saved_paths = {}        # To store output file/directory paths
-        self.custom_defaults = load_defaults()    # load saved defaults
         self.setup_ui()
+        self.poll_ui_queue()
 
     def setup_ui(self):
         self.root.title("SRA Toolkit GUI")
@@ -165,14 +901,52 @@ class SraToolkitGUI:
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
 
         # Keyboard shortcuts
-        self.root.bind('<Control-q>', lambda e: self.root.quit())
+        self.root.bind('<Control-q>', lambda e: self.exit_application())
         self.root.bind('<F1>', lambda e: self.show_help())
+        self.root.protocol("WM_DELETE_WINDOW", self.exit_application)
 
     def exit_application(self):
+        self.orchestrator.shutdown()
         self.root.quit()
 
     # -------------------------- Common Methods --------------------------
+    def poll_ui_queue(self):
+        # All widget updates from running jobs are applied here, on the Tk thread
+        try:
+            while True:
+                callback, args = self.ui_queue.get_nowait()
+                try:
+                    callback(*args)
+                except Exception:
+                    logging.exception("Error handling job event")
+        except queue.Empty:
+            pass
+        self.root.after(UI_POLL_INTERVAL, self.poll_ui_queue)
+
+    def submit_job(self, job):
+        on_done = job.on_done
+
+        def done(job):
+            self.running_jobs -= 1
+            if self.running_jobs == 0:
+                self.global_progress.stop()
+            if on_done:
+                on_done(job)
+        job.on_done = done
+        temp_dir = self.custom_defaults['temp_dir']
+        if temp_dir and job.env is None:
+            # The toolkit binaries honour the usual temp variables for their scratch files
+            job.env = dict(os.environ, TMPDIR=temp_dir, TMP=temp_dir, TEMP=temp_dir)
+        if self.running_jobs == 0:
+            self.global_progress.start(10)
+        self.running_jobs += 1
+        return self.orchestrator.submit(job)
+
     def run_command(self, cmd, output_widget, progress_widget=None):
+        return self.run_job(Job(cmd), output_widget, progress_widget)
+
+    def run_job(self, job, output_widget, progress_widget=None):
+        cmd = job.cmd
         output_widget.config(state=tk.NORMAL)
         output_widget.delete("1.0", tk.END)
         if progress_widget:
@@ -186,76 +960,61 @@ class SraToolkitGUI:
         # Setup error tag for red text
         output_widget.tag_configure("error", foreground="red")
 
-        self.global_progress.start(10)
+        def on_output(stream, line):
+            if stream == "stderr":
+                output_widget.insert(tk.END, line, "error")
+                if progress_widget:
+                    progress_widget.insert(tk.END, f"[ERROR] {line}")
+            else:
+                output_widget.insert(tk.END, line)
+                output_widget.see(tk.END)
+                if progress_widget:
+                    progress_widget.insert(tk.END, f"[OUTPUT] {line}")
+                    progress_widget.see(tk.END)
 
-        def execute():
-            try:
-                logging.info(f"Executing command: {command_str}")
-                self.current_process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                start_time = time.time()
-                timeout = 300  # 5 minutes
-                while True:
-                    if time.time() - start_time > timeout:
-                        self.current_process.kill()
-                        output_widget.insert(tk.END, "Error: Command timed out after 5 minutes\n", "error")
-                        self.status_bar.config(text="Error: Command timed out")
-                        logging.error("Command timed out")
-                        if progress_widget:
-                            progress_widget.insert(tk.END, "Command timed out.\n")
-                        break
-                    stdout_line = self.current_process.stdout.readline()
-                    stderr_line = self.current_process.stderr.readline()
-                    if stdout_line:
-                        output_widget.insert(tk.END, stdout_line)
-                        output_widget.see(tk.END)
-                        if progress_widget:
-                            progress_widget.insert(tk.END, f"[OUTPUT] {stdout_line}")
-                            progress_widget.see(tk.END)
-                    if stderr_line:
-                        output_widget.insert(tk.END, stderr_line, "error")
-                        if progress_widget:
-                            progress_widget.insert(tk.END, f"[ERROR] {stderr_line}\n")
-                    if not stdout_line and not stderr_line and self.current_process.poll() is not None:
-                        remaining_stdout = self.current_process.stdout.read()
-                        if remaining_stdout:
-                            output_widget.insert(tk.END, remaining_stdout)
-                            if progress_widget:
-                                progress_widget.insert(tk.END, f"[OUTPUT] {remaining_stdout}")
-                        remaining_stderr = self.current_process.stderr.read()
-                        if remaining_stderr:
-                            output_widget.insert(tk.END, "Errors:\n" + remaining_stderr, "error")
-                            if progress_widget:
-                                progress_widget.insert(tk.END, f"[ERROR] {remaining_stderr}\n")
-                        self.status_bar.config(text="Command completed successfully")
-                        logging.info("Command completed successfully")
-                        if progress_widget:
-                            progress_widget.insert(tk.END, "Command completed successfully.\n")
-                        break
-                    time.sleep(0.1)
-            except Exception as e:
-                output_widget.insert(tk.END, f"Error: {str(e)}\n", "error")
+        def on_done(job):
+            if job.status == "completed":
+                self.status_bar.config(text="Command completed successfully")
+                logging.info("Command completed successfully")
+                if progress_widget:
+                    progress_widget.insert(tk.END, "Command completed successfully.\n")
+            elif job.status == "failed":
+                output_widget.insert(tk.END, f"Command exited with code {job.returncode}\n", "error")
+                self.status_bar.config(text=f"Error: Command exited with code {job.returncode}")
+                logging.error(f"Command exited with code {job.returncode}: {command_str}")
+                if progress_widget:
+                    progress_widget.insert(tk.END, f"Command exited with code {job.returncode}.\n")
+            elif job.status == "timeout":
+                output_widget.insert(tk.END, f"Error: Command timed out after {job.timeout} seconds\n", "error")
+                self.status_bar.config(text="Error: Command timed out")
+                logging.error("Command timed out")
+                if progress_widget:
+                    progress_widget.insert(tk.END, "Command timed out.\n")
+            elif job.status == "cancelled":
+                output_widget.insert(tk.END, "Command cancelled.\n", "error")
+                if progress_widget:
+                    progress_widget.insert(tk.END, "Command cancelled.\n")
+            else:
+                output_widget.insert(tk.END, f"Error: {job.error}\n", "error")
                 self.status_bar.config(text="Error: Execution failed")
-                logging.exception("Error during command execution")
                 if progress_widget:
-                    progress_widget.insert(tk.END, f"[EXCEPTION] {str(e)}\n")
-            finally:
-                self.global_progress.stop()
-                self.current_process = None
-                output_widget.see("1.0")
-        threading.Thread(target=execute, daemon=True).start()
+                    progress_widget.insert(tk.END, f"[EXCEPTION] {job.error}\n")
+            output_widget.see("1.0")
+
+        job.on_output = on_output
+        job.on_done = on_done
+        return self.submit_job(job)
 
     def cancel_command(self):
-        if self.current_process:
+        # running_jobs is kept on the Tk thread, so it already counts jobs the loop has not picked up yet
+        if self.running_jobs:
             try:
-                self.current_process.kill()
+                self.orchestrator.cancel_all()
                 self.status_bar.config(text="Process canceled")
                 logging.info("Process canceled by user")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to cancel process: {str(e)}")
                 logging.exception("Error cancelling process")
-            finally:
-                self.current_process = None
-                self.global_progress.stop()
         else:
             messagebox.showinfo("Info", "No process is currently running.")
 
@@ -350,8 +1109,7 @@ class SraToolkitGUI:
         ttk.Label(self.download_tab, text="Batch Prefetch Accessions (one per line):").grid(row=4, column=0, padx=5, pady=5, sticky=tk.W)
         self.batch_prefetch_text = scrolledtext.ScrolledText(self.download_tab, wrap=tk.WORD, width=80, height=4)
         self.batch_prefetch_text.grid(row=5, column=0, columnspan=3, padx=5, pady=5)
-        batch_button = ttk.Button(self.download_tab, text="Run Batch Prefetch", 
-                                  command=lambda: threading.Thread(target=self.run_batch_prefetch, daemon=True).start())
+        batch_button = ttk.Button(self.download_tab, text="Run Batch Prefetch", command=self.run_batch_prefetch)
         batch_button.grid(row=5, column=3, padx=5, pady=5)
         # Progress window
         ttk.Label(self.download_tab, text="Progress:").grid(row=6, column=0, padx=5, pady=(15, 5), sticky=tk.W)
@@ -388,8 +1146,16 @@ class SraToolkitGUI:
         if not accession:
             return
         self.status_bar.config(text="Running prefetch...")
-        cmd = ["prefetch", "--progress", accession]
-        self.run_command(cmd, self.download_output, self.download_progress)
+        job = Job(["prefetch", "--progress", accession])
+        self.register_prefetch_partials(job, accession)
+        self.run_job(job, self.download_output, self.download_progress)
+
+    @staticmethod
+    def register_prefetch_partials(job, accession):
+        # prefetch downloads into ./<accession>/; only a directory this job creates is ours to remove
+        target = os.path.join(os.getcwd(), accession)
+        if not os.path.exists(target):
+            job.register_partial(target)
 
     def run_srapath(self):
         accession = self.validate_input(self.srapath_entry, "Please enter an accession for srapath.")
@@ -404,29 +1170,90 @@ class SraToolkitGUI:
         if not accessions_text:
             messagebox.showerror("Input Error", "Please enter at least one accession number for batch prefetch.")
             return
-        accessions = [line.strip() for line in accessions_text.splitlines() if line.strip()]
+        # Duplicates would run concurrently into the same ./<accession> dir, so keep only the first
+        accessions = list(dict.fromkeys(line.strip() for line in accessions_text.splitlines() if line.strip()))
         self.status_bar.config(text="Running batch prefetch...")
-        self.global_progress.start(10)
+        self.download_output.tag_configure("error", foreground="red")
+        retry_policy = RetryPolicy()
+        remaining = {'count': len(accessions)}
+        failures = []
+
+        def make_callbacks(acc):
+            def on_output(stream, line):
+                if stream == "stderr":
+                    self.download_output.insert(tk.END, f"[{acc}] {line}", "error")
+                else:
+                    self.download_output.insert(tk.END, f"[{acc}] {line}")
+                self.download_output.see(tk.END)
+
+            def on_retry(job, delay):
+                self.download_output.insert(
+                    tk.END, f"[{acc}] {job.failure_class} failure ({job.failure_reason}); retrying in "
+                            f"{delay:.0f}s (attempt {job.attempts + 1}/{retry_policy.attempt_limit(job.failure_class)})\n", "error")
+                self.download_output.see(tk.END)
+
+            def on_done(job):
+                if job.status == "error":
+                    self.download_output.insert(tk.END, f"Error running prefetch for {acc}: {job.error}\n", "error")
+                elif job.status != "completed":
+                    self.download_output.insert(tk.END, f"Prefetch for {acc} {job.status}\n", "error")
+                if job.status != "completed":
+                    failures.append(job)
+                self.download_output.see(tk.END)
+                remaining['count'] -= 1
+                if remaining['count'] == 0:
+                    self.report_batch_failures(accessions, failures)
+            return on_output, on_retry, on_done
+
+        # Jobs are queued at once; the orchestrator's limiter caps how many run together
         for acc in accessions:
-            self.download_output.insert(tk.END, f"\nRunning prefetch for {acc}\n")
-            cmd = ["prefetch", "--progress", acc]
-            try:
-                result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                self.download_output.insert(tk.END, result.stdout)
-                if result.stderr:
-                    self.download_output.insert(tk.END, "Errors:\n" + result.stderr, "error")
-            except Exception as e:
-                self.download_output.insert(tk.END, f"Error running prefetch for {acc}: {str(e)}\n", "error")
-            self.download_output.see(tk.END)
-        self.global_progress.stop()
-        self.status_bar.config(text="Batch prefetch completed")
+            self.download_output.insert(tk.END, f"\nQueued prefetch for {acc}\n")
+            on_output, on_retry, on_done = make_callbacks(acc)
+            job = Job(["prefetch", "--progress", acc], on_output, on_done, timeout=None)
+            job.name = acc
+            job.retry_policy = retry_policy
+            job.on_retry = on_retry
+            self.register_prefetch_partials(job, acc)
+            self.submit_job(job)
+        self.download_output.see(tk.END)
+
+    def report_batch_failures(self, accessions, failures):
+        if not failures:
+            self.status_bar.config(text=f"Batch prefetch completed: {len(accessions)} accession(s) downloaded")
+            logging.info("Batch prefetch completed without failures")
+            return
+        failures.sort(key=lambda job: accessions.index(job.name))
+        lines = []
+        for job in failures:
+            if job.status == "cancelled":
+                reason = "cancelled"
+            elif job.status == "error":
+                reason = f"error: {job.error}"
+            else:
+                reason = f"{job.failure_class}: {job.failure_reason}"
+            lines.append(f"{job.name}\t{reason} (after {job.attempts} attempt(s))")
+        self.download_output.insert(tk.END, f"\nBatch failure report - {len(failures)} of {len(accessions)} "
+                                            f"accession(s) need attention:\n", "error")
+        self.download_output.insert(tk.END, "\n".join(lines) + "\n", "error")
+        logging.error("Batch prefetch failures:\n" + "\n".join(lines))
+        # One accession per line so the file can be pasted straight back into the batch field
+        try:
+            with open(BATCH_FAILURE_REPORT, "w") as f:
+                f.write("\n".join(job.name for job in failures) + "\n")
+            self.download_output.insert(tk.END, f"Failed accessions saved to {os.path.abspath(BATCH_FAILURE_REPORT)}\n")
+        except Exception as e:
+            logging.error("Error saving batch failure report: " + str(e))
+        self.download_output.see(tk.END)
+        self.status_bar.config(text=f"Batch prefetch finished with {len(failures)} failure(s)")
 
     def create_conversion_tab(self):
         self.conversion_tab = ttk.Frame(self.notebook)
         self.notebook.add(self.conversion_tab, text="Conversion")
         info_text = (
             "Converts SRA files to formats like FASTQ and SAM.\n\n"
-            "Select the SRA file, adjust custom parameters if needed, and click the conversion button."
+            "Select the SRA file, adjust custom parameters if needed, and click the conversion button.\n\n"
+            "With 'Stage on local scratch' enabled, the input is copied to the active profile's scratch\n"
+            "directory and converted there; results are moved back once the conversion succeeds."
         )
         info_frame = ttk.Frame(self.conversion_tab)
         info_frame.grid(row=0, column=0, columnspan=4, sticky="w", padx=5, pady=5)
@@ -446,9 +1273,13 @@ class SraToolkitGUI:
         self.gzip_check = ttk.Checkbutton(custom_frame, text="Enable gzip compression", variable=self.gzip_var)
         self.gzip_check.grid(row=0, column=0, padx=5, pady=5, sticky="w")
         ttk.Label(custom_frame, text="Thread Count:").grid(row=0, column=1, padx=5, pady=5, sticky="e")
-        self.thread_count = ttk.Combobox(custom_frame, values=["1", "2", "4", "8"], width=5)
-        self.thread_count.set(self.custom_defaults.get('threads', "1"))
+        self.thread_count = ttk.Combobox(custom_frame, values=thread_choices(), width=5)
+        self.thread_count.set(str(self.custom_defaults['tool_threads'].get('fastq-dump', 1)))
         self.thread_count.grid(row=0, column=2, padx=5, pady=5, sticky="w")
+        self.conv_stage_var = tk.BooleanVar(value=self.custom_defaults['stage_inputs'])
+        conv_stage_check = ttk.Checkbutton(custom_frame, text="Stage on local scratch", variable=self.conv_stage_var)
+        conv_stage_check.grid(row=0, column=3, padx=5, pady=5, sticky="w")
+        ToolTip(conv_stage_check, "Copy the input to the profile's scratch directory and convert there")
         # Progress window
         ttk.Label(self.conversion_tab, text="Progress:").grid(row=3, column=0, padx=5, pady=(15, 5), sticky=tk.W)
         self.conv_progress = scrolledtext.ScrolledText(self.conversion_tab, wrap=tk.WORD, width=80, height=6)
@@ -469,15 +1300,57 @@ class SraToolkitGUI:
         thread = self.thread_count.get().strip()
         if thread:
             custom_params.extend(["--threads", thread])
-        cmd = ["fastq-dump", "--progress"] + custom_params + [sra_file]
-        self.run_command(cmd, self.conv_output, self.conv_progress)
+        output_dir = os.getcwd()
+        # Accessions and remote inputs are fetched by the tool itself, so only local files are staged
+        stage_skipped = self.conv_stage_var.get() and not os.path.isfile(sra_file)
+        if self.conv_stage_var.get() and not stage_skipped:
+            staging_dir = self.create_staging_dir(sra_file)
+            if not staging_dir:
+                return
+            input_path = os.path.join(staging_dir, os.path.basename(sra_file))
+            temp_dir = os.path.join(staging_dir, "out")
+            os.mkdir(temp_dir)
+        else:
+            staging_dir = None
+            input_path = sra_file
+            # Write into a temp dir beside the final location and move the files in only on success
+            temp_dir = tempfile.mkdtemp(prefix=".fastq-dump-", dir=output_dir)
+        cmd = ["fastq-dump", "--progress"] + custom_params + ["-O", temp_dir, input_path]
+        job = Job(cmd)
+        job.register_output_dir(temp_dir, output_dir)
+        if staging_dir:
+            job.staging_dir = staging_dir
+            job.register_staged_input(sra_file, input_path)
+        self.run_job(job, self.conv_output, self.conv_progress)
+        if stage_skipped:
+            self.note_stage_skipped(sra_file, self.conv_progress)
+
+    def create_staging_dir(self, input_path):
+        # Returns a fresh per-job dir on scratch, or None after telling the user why staging is not possible
+        if not self.custom_defaults['scratch_dir']:
+            messagebox.showerror("Staging Error", "No scratch directory is set in the active profile. "
+                                                  "Set one in the Settings tab or disable staging.")
+            return None
+        scratch_root = os.path.join(self.custom_defaults['scratch_dir'], SCRATCH_SUBDIR)
+        try:
+            os.makedirs(scratch_root, exist_ok=True)
+            return tempfile.mkdtemp(prefix="job-", dir=scratch_root)
+        except OSError as e:
+            messagebox.showerror("Staging Error", f"Failed to create scratch dir in {scratch_root}: {str(e)}")
+            return None
+
+    def note_stage_skipped(self, input_path, progress_widget):
+        logging.info(f"Not a local file, running in place without staging: {input_path}")
+        progress_widget.insert(tk.END, f"Staging skipped, {input_path} is not a local file; running in place.\n")
 
     def create_upload_tab(self):
         self.upload_tab = ttk.Frame(self.notebook)
         self.notebook.add(self.upload_tab, text="Upload/Load")
         info_text = (
             "Converts data (e.g. BAM to SRA) for upload or storage.\n\n"
-            "Enter the BAM file path and desired output filename, then click Run."
+            "Enter the BAM file path and desired output filename, then click Run.\n\n"
+            "With 'Stage on local scratch' enabled, the BAM file is copied to the active profile's scratch\n"
+            "directory and loaded there; the SRA output is moved to its destination on success."
         )
         info_frame = ttk.Frame(self.upload_tab)
         info_frame.grid(row=0, column=0, columnspan=4, sticky="w", padx=5, pady=5)
@@ -496,6 +1369,10 @@ class SraToolkitGUI:
         output_browse_btn = ttk.Button(self.upload_tab, text="Browse", 
                                        command=lambda: self.create_output_browser(self.bamload_out_entry, 'bamload', file_type='file'))
         output_browse_btn.grid(row=2, column=2, padx=5, pady=5, sticky=tk.W)
+        self.upload_stage_var = tk.BooleanVar(value=self.custom_defaults['stage_inputs'])
+        upload_stage_check = ttk.Checkbutton(self.upload_tab, text="Stage on local scratch", variable=self.upload_stage_var)
+        upload_stage_check.grid(row=3, column=1, padx=5, pady=15, sticky=tk.W)
+        ToolTip(upload_stage_check, "Copy the BAM file to the profile's scratch directory and load it there")
         bamload_button = ttk.Button(self.upload_tab, text="Run bam-load", command=self.run_bam_load)
         bamload_button.grid(row=3, column=2, padx=5, pady=15, sticky=tk.E)
         ttk.Label(self.upload_tab, text="Progress:").grid(row=4, column=0, padx=5, pady=(10, 5), sticky=tk.W)
@@ -512,9 +1389,28 @@ class SraToolkitGUI:
         output_sra = self.validate_input(self.bamload_out_entry, "Please enter the output SRA filename.")
         if not output_sra:
             return
+        stage_skipped = self.upload_stage_var.get() and not os.path.isfile(bam_file)
+        if self.upload_stage_var.get() and not stage_skipped:
+            staging_dir = self.create_staging_dir(bam_file)
+            if not staging_dir:
+                return
+            input_path = os.path.join(staging_dir, os.path.basename(bam_file))
+            temp_sra = os.path.join(staging_dir, os.path.basename(output_sra))
+        else:
+            staging_dir = None
+            input_path = bam_file
+            temp_sra = partial_path(output_sra)
+            if os.path.lexists(temp_sra):
+                remove_path(temp_sra)
         self.status_bar.config(text="Running bam-load...")
-        cmd = ["bam-load", "-o", output_sra, bam_file]
-        self.run_command(cmd, self.upload_output, self.upload_progress)
+        job = Job(["bam-load", "-o", temp_sra, input_path])
+        job.register_output(temp_sra, output_sra)
+        if staging_dir:
+            job.staging_dir = staging_dir
+            job.register_staged_input(bam_file, input_path)
+        self.run_job(job, self.upload_output, self.upload_progress)
+        if stage_skipped:
+            self.note_stage_skipped(bam_file, self.upload_progress)
 
     def create_utilities_tab(self):
         self.utilities_tab = ttk.Frame(self.notebook)
@@ -671,42 +1567,192 @@ class SraToolkitGUI:
         self.settings_tab = ttk.Frame(self.notebook)
         self.notebook.add(self.settings_tab, text="Settings")
         info_text = (
-            "Allows you to set default custom parameters that will be applied automatically\n"
-            "to SRA operations (e.g., default thread count, gzip option).\n\n"
-            "Adjust the settings below and click 'Save Defaults'. These settings will pre-populate\n"
-            "the custom parameter fields in the respective tabs and be saved between sessions."
+            "Manages named performance profiles that are applied automatically\n"
+            "to SRA operations (e.g., thread count, gzip option, concurrent jobs).\n\n"
+            "Pick a profile to load it, adjust the settings below and click 'Save Profile'.\n"
+            "'Auto-tune' proposes settings from this machine's cores, memory and free disk.\n"
+            "The active profile pre-populates the custom parameter fields in the respective tabs\n"
+            "and is saved between sessions."
         )
         info_frame = ttk.Frame(self.settings_tab)
         info_frame.grid(row=0, column=0, columnspan=4, sticky="w", padx=5, pady=5)
         info_button = ttk.Button(info_frame, text="i", width=2,
                                  command=lambda: self.show_tab_info("Settings Tab", info_text))
         info_button.grid(row=0, column=0, sticky="w", padx=5, pady=5)
+        # Profile selection
+        ttk.Label(self.settings_tab, text="Profile:").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
+        self.profile_select = ttk.Combobox(self.settings_tab, values=sorted(self.config['profiles']), width=20)
+        self.profile_select.set(self.config['active_profile'])
+        self.profile_select.grid(row=1, column=1, padx=5, pady=5, sticky="w")
+        self.profile_select.bind("<<ComboboxSelected>>", lambda e: self.load_profile(self.profile_select.get()))
+        ToolTip(self.profile_select, "Select a profile to load it, or type a new name and save")
         # Default gzip option
-        self.default_gzip_var = tk.BooleanVar(value=False)
+        self.default_gzip_var = tk.BooleanVar()
         gzip_check = ttk.Checkbutton(self.settings_tab, text="Default: Enable gzip compression", variable=self.default_gzip_var)
-        gzip_check.grid(row=1, column=0, padx=5, pady=5, sticky="w")
+        gzip_check.grid(row=2, column=0, padx=5, pady=5, sticky="w")
         # Default thread count
-        ttk.Label(self.settings_tab, text="Default Thread Count:").grid(row=2, column=0, padx=5, pady=5, sticky=tk.W)
-        self.default_thread = ttk.Combobox(self.settings_tab, values=["1", "2", "4", "8"], width=5)
-        self.default_thread.set("1")
-        self.default_thread.grid(row=2, column=1, padx=5, pady=5, sticky="w")
-        # Save Defaults button
-        save_btn = ttk.Button(self.settings_tab, text="Save Defaults", command=self.save_defaults)
-        save_btn.grid(row=3, column=0, padx=5, pady=10, sticky="w")
+        ttk.Label(self.settings_tab, text="Default Thread Count:").grid(row=3, column=0, padx=5, pady=5, sticky=tk.W)
+        self.default_thread = ttk.Combobox(self.settings_tab, values=thread_choices(), width=5)
+        self.default_thread.grid(row=3, column=1, padx=5, pady=5, sticky="w")
+        # Concurrency limit
+        ttk.Label(self.settings_tab, text="Max Concurrent Jobs:").grid(row=4, column=0, padx=5, pady=5, sticky=tk.W)
+        self.default_max_jobs = ttk.Spinbox(self.settings_tab, from_=1, to=256, width=5)
+        self.default_max_jobs.grid(row=4, column=1, padx=5, pady=5, sticky="w")
+        # Temp and scratch directories
+        ttk.Label(self.settings_tab, text="Temp Directory:").grid(row=5, column=0, padx=5, pady=5, sticky=tk.W)
+        self.default_temp_dir = ttk.Entry(self.settings_tab, width=40)
+        self.default_temp_dir.grid(row=5, column=1, padx=5, pady=5, sticky="w")
+        self.create_file_browser(self.default_temp_dir, file_type="dir").grid(row=5, column=2, padx=5, pady=5)
+        ttk.Label(self.settings_tab, text="Scratch Directory:").grid(row=6, column=0, padx=5, pady=5, sticky=tk.W)
+        self.default_scratch_dir = ttk.Entry(self.settings_tab, width=40)
+        self.default_scratch_dir.grid(row=6, column=1, padx=5, pady=5, sticky="w")
+        self.create_file_browser(self.default_scratch_dir, file_type="dir").grid(row=6, column=2, padx=5, pady=5)
+        self.default_stage_var = tk.BooleanVar()
+        stage_check = ttk.Checkbutton(self.settings_tab, text="Default: Stage inputs on scratch", variable=self.default_stage_var)
+        stage_check.grid(row=6, column=3, padx=5, pady=5, sticky="w")
+        ToolTip(stage_check, "Pre-select 'Stage on local scratch' in the Conversion and Upload tabs")
+        # I/O buffer size
+        ttk.Label(self.settings_tab, text="I/O Buffer Size (KiB):").grid(row=7, column=0, padx=5, pady=5, sticky=tk.W)
+        self.default_io_buffer = ttk.Entry(self.settings_tab, width=10)
+        self.default_io_buffer.grid(row=7, column=1, padx=5, pady=5, sticky="w")
+        # Scratch quota
+        ttk.Label(self.settings_tab, text="Scratch Quota (GiB, 0 = unlimited):").grid(row=8, column=0, padx=5, pady=5, sticky=tk.W)
+        self.default_scratch_quota = ttk.Entry(self.settings_tab, width=10)
+        self.default_scratch_quota.grid(row=8, column=1, padx=5, pady=5, sticky="w")
+        # Buttons
+        button_frame = ttk.Frame(self.settings_tab)
+        button_frame.grid(row=9, column=0, columnspan=3, padx=5, pady=10, sticky="w")
+        save_btn = ttk.Button(button_frame, text="Save Profile", command=self.save_defaults)
+        save_btn.grid(row=0, column=0, padx=(0, 5))
+        autotune_btn = ttk.Button(button_frame, text="Auto-tune", command=self.auto_tune)
+        autotune_btn.grid(row=0, column=1, padx=5)
+        ToolTip(autotune_btn, "Propose settings for this machine; review them and click Save Profile to keep them")
+        delete_btn = ttk.Button(button_frame, text="Delete Profile", command=self.delete_profile)
+        delete_btn.grid(row=0, column=2, padx=5)
         # Display current defaults
-        self.defaults_display = ttk.Label(self.settings_tab, text="Current Defaults: Default gzip: False, Thread Count: 1")
-        self.defaults_display.grid(row=4, column=0, columnspan=2, padx=5, pady=5, sticky="w")
+        self.defaults_display = ttk.Label(self.settings_tab, text="")
+        self.defaults_display.grid(row=10, column=0, columnspan=3, padx=5, pady=5, sticky="w")
+        self.show_profile(self.custom_defaults)
+        self.update_defaults_display()
 
-    def save_defaults(self):
-        self.custom_defaults['gzip'] = self.default_gzip_var.get()
-        self.custom_defaults['threads'] = self.default_thread.get()
-        display_text = f"Default gzip: {self.custom_defaults['gzip']}, Thread Count: {self.custom_defaults['threads']}"
+    def show_profile(self, profile):
+        self.default_gzip_var.set(profile['gzip'])
+        self.default_thread.set(str(profile['tool_threads'].get('fastq-dump', 1)))
+        self.default_max_jobs.set(profile['max_concurrent_jobs'])
+        self.default_stage_var.set(profile['stage_inputs'])
+        for entry, value in ((self.default_temp_dir, profile['temp_dir']),
+                             (self.default_scratch_dir, profile['scratch_dir']),
+                             (self.default_io_buffer, str(profile['io_buffer_size'] // 1024)),
+                             (self.default_scratch_quota, str(profile['scratch_quota_gib']))):
+            entry.delete(0, tk.END)
+            entry.insert(0, value)
+
+    def read_profile(self):
+        # Collect the Settings tab fields into a validated profile; raises ValueError
+        numbers = {}
+        for key, widget in (('fastq-dump threads', self.default_thread),
+                            ('max_concurrent_jobs', self.default_max_jobs),
+                            ('io_buffer_size', self.default_io_buffer),
+                            ('scratch_quota_gib', self.default_scratch_quota)):
+            try:
+                numbers[key] = int(widget.get().strip())
+            except ValueError:
+                raise ValueError(f"'{key}' must be a whole number")
+        profile = dict(self.custom_defaults)
+        profile.update({
+            'gzip': self.default_gzip_var.get(),
+            'tool_threads': dict(self.custom_defaults['tool_threads'], **{'fastq-dump': numbers['fastq-dump threads']}),
+            'max_concurrent_jobs': numbers['max_concurrent_jobs'],
+            'temp_dir': self.default_temp_dir.get().strip(),
+            'scratch_dir': self.default_scratch_dir.get().strip(),
+            'io_buffer_size': numbers['io_buffer_size'] * 1024,
+            'scratch_quota_gib': numbers['scratch_quota_gib'],
+            'stage_inputs': self.default_stage_var.get(),
+        })
+        return validate_profile(profile)
+
+    def update_defaults_display(self):
+        profile = self.custom_defaults
+        display_text = (f"Profile: {self.config['active_profile']}, Default gzip: {profile['gzip']}, "
+                        f"Thread Count: {profile['tool_threads'].get('fastq-dump', 1)}, "
+                        f"Max Jobs: {profile['max_concurrent_jobs']}")
         self.defaults_display.config(text=f"Current Defaults: {display_text}")
+
+    def apply_profile(self, name):
+        self.config['active_profile'] = name
+        self.custom_defaults = self.config['profiles'][name]
         # Update Conversion tab controls
         self.gzip_var.set(self.custom_defaults['gzip'])
-        self.thread_count.set(self.custom_defaults['threads'])
-        save_defaults_to_file(self.custom_defaults)
-        messagebox.showinfo("Defaults Saved", "Custom parameter defaults have been saved.")
+        self.thread_count.set(str(self.custom_defaults['tool_threads'].get('fastq-dump', 1)))
+        self.orchestrator.set_concurrency(self.custom_defaults['max_concurrent_jobs'])
+        self.orchestrator.io_buffer_size = self.custom_defaults['io_buffer_size']
+        self.orchestrator.scratch_quota = self.custom_defaults['scratch_quota_gib'] * 1024 ** 3
+        self.conv_stage_var.set(self.custom_defaults['stage_inputs'])
+        self.upload_stage_var.set(self.custom_defaults['stage_inputs'])
+        self.update_defaults_display()
+
+    def load_profile(self, name):
+        if name not in self.config['profiles']:
+            return
+        self.apply_profile(name)
+        self.show_profile(self.custom_defaults)
+        save_defaults_to_file(self.config)
+
+    def save_defaults(self):
+        name = self.profile_select.get().strip()
+        if not name:
+            messagebox.showerror("Input Error", "Please enter a profile name.")
+            return
+        try:
+            profile = self.read_profile()
+        except ValueError as e:
+            messagebox.showerror("Invalid Settings", str(e))
+            return
+        for key in ('temp_dir', 'scratch_dir'):
+            if profile[key] and not os.path.isdir(profile[key]):
+                messagebox.showerror("Invalid Settings", f"'{key}' does not exist: {profile[key]}")
+                return
+        self.config['profiles'][name] = profile
+        self.profile_select.config(values=sorted(self.config['profiles']))
+        self.apply_profile(name)
+        save_defaults_to_file(self.config)
+        messagebox.showinfo("Defaults Saved", f"Profile '{name}' has been saved and activated.")
+
+    def auto_tune(self):
+        scratch = self.default_scratch_dir.get().strip()
+        resources = detect_host_resources(scratch if scratch and os.path.isdir(scratch) else tempfile.gettempdir())
+        profile = auto_tune_profile(resources)
+        # Auto-tune only proposes sizes, so keep the directories and staging choice already entered
+        profile.update({'temp_dir': self.default_temp_dir.get().strip(), 'scratch_dir': scratch,
+                        'stage_inputs': self.default_stage_var.get()})
+        self.show_profile(profile)
+        # Presets are per host, so suggest saving under this machine's name
+        self.profile_select.set(platform.node() or "auto")
+        gib = 1024 ** 3
+        summary = [f"CPU cores: {resources['cpus']}"]
+        if resources['memory']:
+            summary.append(f"Memory: {resources['memory'] / gib:.1f} GiB")
+        if resources['free_disk'] is not None:
+            summary.append(f"Free disk: {resources['free_disk'] / gib:.1f} GiB")
+        logging.info("Auto-tune detected " + ", ".join(summary))
+        messagebox.showinfo("Auto-tune", "Detected " + ", ".join(summary) +
+                            ".\n\nReview the proposed settings and click 'Save Profile' to keep them.")
+
+    def delete_profile(self):
+        name = self.profile_select.get().strip()
+        if name not in self.config['profiles']:
+            messagebox.showerror("Error", f"No saved profile named '{name}'.")
+            return
+        if len(self.config['profiles']) == 1:
+            messagebox.showerror("Error", "The last remaining profile cannot be deleted.")
+            return
+        del self.config['profiles'][name]
+        self.profile_select.config(values=sorted(self.config['profiles']))
+        if name == self.config['active_profile']:
+            self.apply_profile(sorted(self.config['profiles'])[0])
+        self.profile_select.set(self.config['active_profile'])
+        self.show_profile(self.custom_defaults)
+        save_defaults_to_file(self.config)
 
     # -------------------------- Additional Command Methods --------------------------
     def run_rcexplain(self):
@@ -0,0 +1,65 @@
+import importlib.util
+import os
+import queue
+import time
+
+import pytest
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "SRA3.2compleate.py")
+
+
+@pytest.fixture(scope="session")
+def sra(tmp_path_factory):
+    # The script's filename contains a dot, so it has to be loaded by path. Importing it
+    # also configures logging to sra_gui.log in the working directory, so do that elsewhere.
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("logs"))
+    try:
+        spec = importlib.util.spec_from_file_location("sra_gui", SCRIPT)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        os.chdir(cwd)
+    return module
+
+
+@pytest.fixture
+def ui_queue():
+    return queue.Queue()
+
+
+@pytest.fixture
+def orchestrator(sra, ui_queue):
+    orchestrator = sra.ProcessOrchestrator(ui_queue)
+    yield orchestrator
+    orchestrator.shutdown()
+
+
+@pytest.fixture
+def drain(ui_queue):
+    # Play the Tk side: run posted callbacks until `until()` is true
+    def drain(until, timeout=15):
+        deadline = time.monotonic() + timeout
+        while not until():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise AssertionError("timed out waiting for job events")
+            try:
+                callback, args = ui_queue.get(timeout=min(remaining, 0.05))
+            except queue.Empty:
+                continue
+            callback(*args)
+    return drain
+
+
+@pytest.fixture
+def run_jobs(orchestrator, drain):
+    # Submit jobs and wait until every one has reported on_done; returns them in finishing order
+    def run_jobs(*jobs, timeout=15):
+        finished = []
+        for job in jobs:
+            job.on_done = finished.append
+            orchestrator.submit(job)
+        drain(lambda: len(finished) == len(jobs), timeout)
+        return finished
+    return run_jobs
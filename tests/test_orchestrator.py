@@ -0,0 +1,204 @@
+import asyncio
+import os
+import time
+
+
+# -------------------------- Concurrency limiter --------------------------
+def test_limiter_caps_concurrency_and_applies_new_limit_to_waiters(sra):
+    async def scenario():
+        limiter = sra.ConcurrencyLimiter(4)
+        running = []
+        peak = {'value': 0}
+
+        async def worker():
+            async with limiter:
+                running.append(1)
+                peak['value'] = max(peak['value'], len(running))
+                await asyncio.sleep(0.02)
+                running.pop()
+
+        tasks = [asyncio.ensure_future(worker()) for _ in range(12)]
+        await asyncio.sleep(0.005)
+        assert limiter.active == 4
+        limiter.set_limit(1)
+        while limiter.active > 1:   # the first wave is allowed to finish
+            await asyncio.sleep(0.005)
+        peak['value'] = 0
+        await asyncio.gather(*tasks)
+        assert peak['value'] == 1
+        assert limiter.active == 0
+    asyncio.run(scenario())
+
+
+def test_limiter_raising_limit_wakes_waiters(sra):
+    async def scenario():
+        limiter = sra.ConcurrencyLimiter(1)
+        await limiter.__aenter__()
+        waiter = asyncio.ensure_future(limiter.__aenter__())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        limiter.set_limit(2)
+        await asyncio.wait_for(waiter, 1)
+        assert limiter.active == 2
+    asyncio.run(scenario())
+
+
+def test_limiter_cancelled_waiter_does_not_leak_a_slot(sra):
+    async def scenario():
+        limiter = sra.ConcurrencyLimiter(1)
+        await limiter.__aenter__()
+        first = asyncio.ensure_future(limiter.__aenter__())
+        second = asyncio.ensure_future(limiter.__aenter__())
+        await asyncio.sleep(0)
+        await limiter.__aexit__(None, None, None)   # wakes `first`...
+        first.cancel()                              # ...which is cancelled before it runs
+        await asyncio.wait_for(second, 1)           # so the slot must pass on to `second`
+        assert limiter.active == 1
+    asyncio.run(scenario())
+
+
+# -------------------------- Running jobs --------------------------
+def test_job_streams_output_and_reports_status(sra, run_jobs):
+    lines = []
+    ok = sra.Job(["sh", "-c", "echo out; echo err >&2"], lambda stream, line: lines.append((stream, line)))
+    failed = sra.Job(["sh", "-c", "exit 3"])
+    missing = sra.Job(["no-such-sra-tool"])
+    run_jobs(ok, failed, missing)
+    assert ok.status == "completed" and sorted(lines) == [("stderr", "err\n"), ("stdout", "out\n")]
+    assert ok.stderr_lines == ["err\n"]
+    assert failed.status == "failed" and failed.returncode == 3
+    assert missing.status == "error" and missing.error
+
+
+def test_orchestrator_respects_concurrency_limit(sra, orchestrator, run_jobs, tmp_path):
+    orchestrator.set_concurrency(2)
+    log = tmp_path / "log"
+    # Each job records when it starts and ends; at most two may overlap
+    script = f"echo start >> {log}; sleep 0.2; echo end >> {log}"
+    run_jobs(*[sra.Job(["sh", "-c", script]) for _ in range(6)])
+    running = peak = 0
+    for event in log.read_text().split():
+        running += 1 if event == "start" else -1
+        peak = max(peak, running)
+    assert peak == 2
+
+
+def test_timeout_terminates_job(sra, run_jobs):
+    job = sra.Job(["sleep", "30"], timeout=0.3)
+    start = time.monotonic()
+    run_jobs(job)
+    assert job.status == "timeout"
+    assert job.returncode is not None
+    assert time.monotonic() - start < 5
+
+
+def test_overlong_line_terminates_child(sra, orchestrator, run_jobs):
+    orchestrator.stream_limit = 1024
+    job = sra.Job(["sh", "-c", "head -c 5000 /dev/zero | tr '\\0' a; sleep 30"])
+    run_jobs(job)
+    assert job.status == "error"
+    assert job.returncode is not None
+
+
+def test_shutdown_terminates_running_jobs(sra, ui_queue, tmp_path):
+    orchestrator = sra.ProcessOrchestrator(ui_queue)
+    pid_file = tmp_path / "pids"
+    job = sra.Job(["sh", "-c", f"sleep 30 & echo $! > {pid_file}; sleep 30"])
+    orchestrator.submit(job)
+    deadline = time.monotonic() + 5
+    while not (pid_file.exists() and pid_file.read_text().strip()):
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+    helper = int(pid_file.read_text())
+    orchestrator.shutdown()
+    assert job.status == "cancelled"
+    assert job.process.returncode is not None
+    time.sleep(0.1)
+    assert not process_alive(helper)
+    assert not orchestrator.thread.is_alive()
+
+
+def process_alive(pid):
+    # A killed helper may linger as a zombie until init reaps it; that counts as dead
+    if os.path.isdir("/proc"):
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                return f.read().rsplit(")", 1)[-1].split()[0] != "Z"
+        except FileNotFoundError:
+            return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+# -------------------------- Partial outputs --------------------------
+def test_remove_path_survives_leftover_from_interrupted_delete(sra, tmp_path):
+    target = tmp_path / "SRR000001"
+    (target / "nested").mkdir(parents=True)
+    (target / "nested" / "SRR000001.sra.tmp").write_text("partial")
+    # Both the old fixed name and an interrupted unique name may be lying around
+    (tmp_path / "SRR000001.deleting" / "junk").mkdir(parents=True)
+    sra.remove_path(str(target))
+    sra.remove_path(str(target))
+    assert not target.exists()
+    assert sorted(os.listdir(tmp_path)) == ["SRR000001.deleting"]
+    single = tmp_path / "reads.fastq"
+    single.write_text("ACGT")
+    sra.remove_path(str(single))
+    assert sorted(os.listdir(tmp_path)) == ["SRR000001.deleting"]
+
+
+def wait_for_file(path, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not (path.exists() and path.read_text().strip()):
+        assert time.monotonic() < deadline, f"{path} never appeared"
+        time.sleep(0.02)
+
+
+def test_cancel_kills_whole_group_and_removes_partials(sra, orchestrator, drain, tmp_path, monkeypatch):
+    monkeypatch.setattr(sra, "TERMINATE_GRACE", 0.3)
+    partial = tmp_path / "SRR000001"
+    pid_file = tmp_path / "helper.pid"
+    # Both the leader and its helper ignore SIGTERM, so only the SIGKILL sweep can stop them
+    script = (f"mkdir {partial}; echo data > {partial}/SRR000001.sra.tmp; "
+              f"(trap '' TERM; sleep 30) & echo $! > {pid_file}; trap '' TERM; sleep 30")
+    finished = []
+    job = sra.Job(["sh", "-c", script], on_done=finished.append)
+    job.register_partial(str(partial))
+    orchestrator.submit(job)
+    wait_for_file(pid_file)
+    orchestrator.cancel(job)
+    drain(lambda: finished)
+    assert job.status == "cancelled"
+    assert not partial.exists()
+    time.sleep(0.1)
+    assert not process_alive(int(pid_file.read_text()))
+
+
+def test_completed_job_moves_outputs_into_place(sra, run_jobs, tmp_path):
+    final_sra = tmp_path / "out.sra"
+    temp_sra = sra.partial_path(str(final_sra))
+    final_dir = tmp_path / "fastq"
+    final_dir.mkdir()
+    temp_dir = tmp_path / ".fastq-dump-tmp"
+    temp_dir.mkdir()
+    job = sra.Job(["sh", "-c", f"echo sra > {temp_sra}; echo reads > {temp_dir}/SRR1.fastq"])
+    job.register_output(temp_sra, str(final_sra))
+    job.register_output_dir(str(temp_dir), str(final_dir))
+    run_jobs(job)
+    assert job.status == "completed"
+    assert final_sra.read_text() == "sra\n"
+    assert (final_dir / "SRR1.fastq").read_text() == "reads\n"
+    assert sorted(os.listdir(tmp_path)) == ["fastq", "out.sra"]
+
+
+def test_failed_job_removes_temp_outputs(sra, run_jobs, tmp_path):
+    final_sra = tmp_path / "out.sra"
+    temp_sra = sra.partial_path(str(final_sra))
+    job = sra.Job(["sh", "-c", f"echo half > {temp_sra}; exit 1"])
+    job.register_output(temp_sra, str(final_sra))
+    run_jobs(job)
+    assert job.status == "failed"
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,48 @@
+import pytest
+
+
+# -------------------------- Profiles --------------------------
+def test_migrate_version_1_config(sra):
+    config = sra.validate_config({'gzip': True, 'threads': "4"})
+    assert config['version'] == sra.CONFIG_VERSION
+    assert config['active_profile'] == "default"
+    profile = config['profiles']['default']
+    assert profile['gzip'] is True
+    assert profile['tool_threads'] == {'fastq-dump': 4}
+    assert profile['max_concurrent_jobs'] == sra.MAX_CONCURRENT_JOBS
+
+
+def test_validate_config_rejects_bad_files(sra):
+    with pytest.raises(ValueError):
+        sra.validate_config({'version': 99, 'active_profile': "default", 'profiles': {'default': {}}})
+    with pytest.raises(ValueError):
+        sra.validate_config({'version': sra.CONFIG_VERSION, 'active_profile': "missing",
+                             'profiles': {'default': {}}})
+
+
+def test_validate_profile_rejects_bools_and_unknown_keys(sra):
+    with pytest.raises(ValueError) as excinfo:
+        sra.validate_profile({'tool_threads': {'fastq-dump': True}, 'max_concurrent_jobs': True, 'bogus': 1})
+    message = str(excinfo.value)
+    assert "tool_threads" in message and "max_concurrent_jobs" in message and "bogus" in message
+
+
+def test_staging_defaults_to_off(sra):
+    assert sra.validate_profile({'scratch_dir': "/scratch"})['stage_inputs'] is False
+    with pytest.raises(ValueError):
+        sra.validate_profile({'stage_inputs': "yes"})
+
+
+def test_auto_tune_profile(sra):
+    gib = 1024 ** 3
+    profile = sra.auto_tune_profile({'cpus': 16, 'memory': 64 * gib, 'free_disk': 1000 * gib})
+    assert profile['max_concurrent_jobs'] == 8
+    assert profile['tool_threads'] == {'fastq-dump': 2}
+    assert profile['gzip'] is False
+    assert profile['io_buffer_size'] == 8 * 1024 * 1024
+    assert profile['scratch_quota_gib'] == 500
+    # The system temp dir may be slow network storage, so directories and staging stay unset
+    assert profile['temp_dir'] == "" and profile['scratch_dir'] == ""
+    assert profile['stage_inputs'] is False
+    small = sra.auto_tune_profile({'cpus': 1, 'memory': None, 'free_disk': None})
+    assert small['max_concurrent_jobs'] == 1 and small['gzip'] is True
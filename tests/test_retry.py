@@ -0,0 +1,85 @@
+import random
+import time
+
+
+# -------------------------- Failure classification --------------------------
+def test_classify_rc_tuple_transient(sra):
+    stderr = "err: timeout exhausted ( RC(rcNS,rcFile,rcReading,rcTimeout,rcExhausted) )"
+    assert sra.classify_failure(3, stderr)[0] == "transient"
+
+
+def test_classify_rc_tuple_permanent_beats_transient_parts(sra):
+    stderr = "err: ( RC(rcNS,rcFile,rcReading,rcFile,rcNotFound) )"
+    assert sra.classify_failure(3, stderr) == ("permanent", "RC(rcNS,rcFile,rcReading,rcFile,rcNotFound)")
+
+
+def test_classify_permanent_text_beats_transient_text(sra):
+    stderr = "err: item not found within network system module - no data ( 404 )"
+    assert sra.classify_failure(3, stderr)[0] == "permanent"
+
+
+def test_classify_transient_text(sra):
+    assert sra.classify_failure(3, "curl: connection reset by peer") == ("transient", "connection reset")
+
+
+def test_classify_uses_rcexplain_output(sra):
+    explanation = "rc 1234567 => RC(rcNS,rcStream,rcReading,rcConnection,rcFailed)"
+    assert sra.classify_failure(3, "rc = 1234567", explanation)[0] == "transient"
+
+
+def test_classify_signal_and_unknown(sra):
+    assert sra.classify_failure(-9, "")[0] == "transient"
+    assert sra.classify_failure(3, "something odd") == ("unknown", "exit code 3")
+
+
+# -------------------------- Retry policy --------------------------
+def test_should_retry_by_failure_class(sra):
+    policy = sra.RetryPolicy(max_attempts=3, unknown_attempts=2)
+    assert [policy.should_retry("transient", n) for n in (1, 2, 3)] == [True, True, False]
+    assert [policy.should_retry("unknown", n) for n in (1, 2)] == [True, False]
+    assert not policy.should_retry("permanent", 1)
+    assert policy.attempt_limit("unknown") == 2
+
+
+def test_delay_is_jittered_and_capped(sra):
+    policy = sra.RetryPolicy(base_delay=2, max_delay=10)
+    random.seed(0)
+    for attempt in range(1, 10):
+        for _ in range(20):
+            delay = policy.delay(attempt)
+            assert 0 <= delay <= min(10, 2 * 2 ** (attempt - 1))
+
+
+def test_default_retry_window_rides_out_a_long_outage(sra, monkeypatch):
+    # With jitter at its upper bound, the delays between the default attempts
+    # must reach RETRY_MAX_DELAY and add up to several minutes
+    monkeypatch.setattr(sra.random, "uniform", lambda low, high: high)
+    policy = sra.RetryPolicy()
+    delays = [policy.delay(attempt) for attempt in range(1, policy.max_attempts)]
+    assert delays[-1] == sra.RETRY_MAX_DELAY
+    assert sum(delays) >= 5 * 60
+
+
+# -------------------------- Retrying jobs --------------------------
+def test_cancel_while_retry_waits_for_a_slot_signals_nothing(sra, orchestrator, drain, tmp_path):
+    started = tmp_path / "started"
+    script = f"echo yes > {started}; sleep 0.2; echo 'connection reset' >&2; exit 3"
+    retried = []
+    finished = []
+    job = sra.Job(["sh", "-c", script], on_done=finished.append)
+    job.retry_policy = sra.RetryPolicy(base_delay=0.01)
+    job.on_retry = lambda job, delay: retried.append(delay)
+    signals = []
+    orchestrator._signal_group = lambda job, sig: signals.append((job.process.pid, sig))
+    orchestrator.submit(job)
+    drain(started.exists)
+    # No free slot for the second attempt, so it is still waiting when the cancel arrives
+    orchestrator.set_concurrency(0)
+    drain(lambda: retried)
+    time.sleep(0.2)     # past the backoff sleep, into the wait for a slot
+    orchestrator.cancel(job)
+    drain(lambda: finished)
+    assert job.status == "cancelled"
+    assert job.attempts == 2
+    assert job.process is None
+    assert signals == []
@@ -0,0 +1,98 @@
+import errno
+import os
+import threading
+import time
+
+import pytest
+
+
+# -------------------------- Scratch staging --------------------------
+def make_dir(path, size, mtime):
+    os.makedirs(path)
+    with open(os.path.join(path, "data"), "wb") as f:
+        f.write(b"x" * size)
+    os.utime(path, (mtime, mtime))
+
+
+def test_enforce_scratch_quota_removes_oldest_stale_dirs(sra, tmp_path):
+    make_dir(tmp_path / "job-old", 400, 1000)
+    make_dir(tmp_path / "job-mid", 400, 2000)
+    make_dir(tmp_path / "job-active", 400, 500)
+    sra.enforce_scratch_quota(str(tmp_path), 1000, {str(tmp_path / "job-active")}, needed=100)
+    assert sorted(os.listdir(tmp_path)) == ["job-active", "job-mid"]
+
+
+def test_enforce_scratch_quota_leaves_usage_under_quota(sra, tmp_path):
+    make_dir(tmp_path / "job-old", 400, 1000)
+    sra.enforce_scratch_quota(str(tmp_path), 1000, set())
+    sra.enforce_scratch_quota(str(tmp_path), 0, set())
+    assert os.listdir(tmp_path) == ["job-old"]
+
+
+def test_move_path_across_filesystems(sra, tmp_path, monkeypatch):
+    src_root = tmp_path / "scratch"
+    src = src_root / "out"
+    src.mkdir(parents=True)
+    (src / "reads.fastq").write_text("ACGT")
+    dst = tmp_path / "final" / "out"
+    dst.parent.mkdir()
+    real_replace = os.replace
+
+    def cross_device_replace(a, b):
+        # Renames leaving the scratch tree behave like a move to another filesystem
+        if str(a).startswith(str(src_root)) and not str(b).startswith(str(src_root)):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+        return real_replace(a, b)
+    monkeypatch.setattr(sra.os, "replace", cross_device_replace)
+
+    sra.move_path(str(src), str(dst), buffer_size=2)
+    assert (dst / "reads.fastq").read_text() == "ACGT"
+    assert not src.exists()
+    assert sorted(os.listdir(dst.parent)) == ["out"]
+
+
+def test_copy_path_stops_when_aborted(sra, tmp_path):
+    src = tmp_path / "in.sra"
+    src.write_bytes(b"x" * 1024)
+    abort = threading.Event()
+    abort.set()
+    with pytest.raises(InterruptedError):
+        sra.copy_path(str(src), str(tmp_path / "out.sra"), buffer_size=16, abort=abort)
+
+
+def test_cancel_during_staging_stops_the_copy(sra, orchestrator, drain, tmp_path, monkeypatch):
+    src = tmp_path / "in.sra"
+    src.write_bytes(b"x" * (8 * 1024 * 1024))
+    staging_dir = tmp_path / "scratch" / "job-1"
+    staging_dir.mkdir(parents=True)
+    staged = staging_dir / "in.sra"
+
+    def no_link(src, dst):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+    monkeypatch.setattr(sra.os, "link", no_link)   # force a real copy
+    copies = []
+    real_stage_input = sra.stage_input
+
+    def recording_stage_input(*args):
+        try:
+            real_stage_input(*args)
+            copies.append("finished")
+        except BaseException as e:
+            copies.append(type(e).__name__)
+            raise
+    monkeypatch.setattr(sra, "stage_input", recording_stage_input)
+    orchestrator.io_buffer_size = 1   # slow enough to cancel mid-copy
+    finished = []
+    job = sra.Job(["cat", str(staged)], on_done=finished.append)
+    job.staging_dir = str(staging_dir)
+    job.register_staged_input(str(src), str(staged))
+    orchestrator.submit(job)
+    drain(lambda: os.path.exists(sra.partial_path(str(staged))))
+    start = time.monotonic()
+    orchestrator.cancel(job)
+    drain(lambda: finished)
+    assert time.monotonic() - start < 2
+    assert job.status == "cancelled"
+    # on_done is only posted once the copy thread itself has stopped
+    assert copies == ["InterruptedError"]
+    assert not staging_dir.exists()